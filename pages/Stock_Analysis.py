@@ -1,15 +1,19 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+import numpy as np
 import datetime
 
+from pages.utils.data_cache import cached_history, cached_info, get_ticker
+
 from pages.utils.plotly_figure import (
     plotly_table,
     candlestick_chart,
     close_chart,
     rsi_chart,
     macd_chart,
-    moving_average_chart
+    moving_average_chart,
+    ohlc_snapshot,
+    snapshot_indicators,
 )
 
 # -------------------- PAGE CONFIG --------------------
@@ -45,69 +49,90 @@ with col3:
 
 # -------------------- LOAD DATA (CACHED SAFE VERSION) --------------------
 
-@st.cache_data
-def load_stock_data(symbol, start, end):
-    data = yf.download(symbol, start=start, end=end)
+@st.cache_data(ttl=900)
+def load_full_history(symbol):
+    # Sorted once here so the chart helpers can binary-search the index
+    return cached_history(symbol, period='max').sort_index()
 
-    ticker = yf.Ticker(symbol)
+@st.cache_data(ttl=900)
+def load_fast_info(symbol):
     try:
-        info = ticker.get_info()
+        fi = get_ticker(symbol).fast_info
+        return dict(marketCap=fi.market_cap)
     except:
-        info = {}
+        return {}
 
-    return data, info
+@st.cache_data
+def load_stock_info(symbol):
+    try:
+        return cached_info(symbol)
+    except:
+        return {}
 
-data, info = load_stock_data(ticker_symbol, start_date, end_date)
+# One max-period fetch feeds the metrics, the table and every chart
+full_data = load_full_history(ticker_symbol)
 
-if data.empty:
+if full_data.empty:
     st.error("Invalid ticker symbol or no historical data found.")
     st.stop()
 
+data = full_data.loc[str(start_date):str(end_date)]
+
+if data.empty:
+    st.error("No historical data found for the selected date range.")
+    st.stop()
+
+fast_info = load_fast_info(ticker_symbol)
+
 st.subheader(ticker_symbol)
 
 # -------------------- COMPANY INFO --------------------
 
-if info:
-    st.write(info.get('longBusinessSummary', 'No summary available.'))
-    st.write("**Sector:**", info.get('sector', 'N/A'))
-    st.write("**Full Time Employees:**", info.get('fullTimeEmployees', 'N/A'))
-    st.write("**Website:**", info.get('website', 'N/A'))
-else:
-    st.warning("Company information could not be loaded.")
-
-# -------------------- FUNDAMENTALS TABLES --------------------
-
-if info:
-    col1, col2 = st.columns(2)
-
-    with col1:
-        df1 = pd.DataFrame(index=['Market Cap', 'Beta', 'EPS', 'PE Ratio'])
-        df1[''] = [
-            info.get("marketCap"),
-            info.get("beta"),
-            info.get("trailingEps"),
-            info.get("trailingPE")
-        ]
-        st.plotly_chart(plotly_table(df1), use_container_width=True)
-
-    with col2:
-        df2 = pd.DataFrame(index=[
-            'Quick Ratio',
-            'Revenue per Share',
-            'Profit Margins',
-            'Debt To Equity',
-            'Return on Equity'
-        ])
-
-        df2[''] = [
-            info.get("quickRatio"),
-            info.get("revenuePerShare"),
-            info.get("profitMargins"),
-            info.get("debtToEquity"),
-            info.get("returnOnEquity")
-        ]
-
-        st.plotly_chart(plotly_table(df2), use_container_width=True)
+# get_info() scrapes ~50 fields over several requests, so it only runs when asked for
+if st.toggle("Show company details"):
+    info = load_stock_info(ticker_symbol)
+
+    if info:
+        st.write(info.get('longBusinessSummary', 'No summary available.'))
+        st.write("**Sector:**", info.get('sector', 'N/A'))
+        st.write("**Full Time Employees:**", info.get('fullTimeEmployees', 'N/A'))
+        st.write("**Website:**", info.get('website', 'N/A'))
+    else:
+        st.warning("Company information could not be loaded.")
+
+    # ---------------- FUNDAMENTALS TABLES ----------------
+
+    if info:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            df1 = pd.DataFrame(index=['Market Cap', 'Beta', 'EPS', 'PE Ratio'])
+            df1[''] = [
+                info.get("marketCap"),
+                info.get("beta"),
+                info.get("trailingEps"),
+                info.get("trailingPE")
+            ]
+            st.plotly_chart(plotly_table(df1), use_container_width=True)
+
+        with col2:
+            df2 = pd.DataFrame(index=[
+                'Quick Ratio',
+                'Revenue per Share',
+                'Profit Margins',
+                'Debt To Equity',
+                'Return on Equity'
+            ])
+
+            df2[''] = [
+                info.get("quickRatio"),
+                info.get("revenuePerShare"),
+                info.get("profitMargins"),
+                info.get("debtToEquity"),
+                info.get("returnOnEquity")
+            ]
+
+            st.plotly_chart(plotly_table(df2), use_container_width=True)
 
 # -------------------- METRICS --------------------
 
@@ -127,9 +152,16 @@ col1.metric(
     round(daily_change, 2)
 )
 
+market_cap = fast_info.get("marketCap")
+col2.metric(
+    "Market Cap",
+    f"{market_cap:,.0f}" if market_cap else "N/A"
+)
+
 # -------------------- LAST 10 DAYS TABLE --------------------
 
-last_10_df = data.tail(10).sort_index(ascending=False).round(3)
+last_10_df = data[['Open', 'High', 'Low', 'Close', 'Volume']].tail(10).sort_index(ascending=False).round(3)
+last_10_df.index = last_10_df.index.strftime('%Y-%m-%d')
 
 st.write("### Historical Data (Last 10 Days)")
 st.plotly_chart(plotly_table(last_10_df), use_container_width=True)
@@ -175,35 +207,37 @@ with col2:
     else:
         indicators = st.selectbox("Indicator", ('RSI', 'Moving Average', 'MACD'))
 
-# -------------------- LOAD FULL HISTORY --------------------
-
-ticker_obj = yf.Ticker(ticker_symbol)
-full_data = ticker_obj.history(period='max')
-
-if full_data.empty:
-    st.warning("No chart data available.")
-    st.stop()
-
 selected_period = '1y' if num_period == '' else num_period
 
+# Float32 struct-of-arrays copy of the history and its indicators, rebuilt only
+# when the data changes; every chart below reuses them
+snap_key = f'arrays::{ticker_symbol}'
+ind_key = f'indicators::{ticker_symbol}'
+snap = st.session_state.get(snap_key)
+if (snap is None or len(snap['t']) != len(full_data)
+        or snap['Close'][-1] != np.float32(full_data['Close'].iloc[-1])):
+    snap = st.session_state[snap_key] = ohlc_snapshot(full_data)
+    st.session_state[ind_key] = snapshot_indicators(snap)
+ind = st.session_state[ind_key]
+
 # -------------------- CHART RENDER --------------------
 
 if chart_type == 'Candle':
 
     st.plotly_chart(
-        candlestick_chart(full_data, selected_period),
+        candlestick_chart(full_data, selected_period, _snapshot=snap),
         use_container_width=True
     )
 
     if indicators == 'RSI':
         st.plotly_chart(
-            rsi_chart(full_data, selected_period),
+            rsi_chart(full_data, selected_period, _snapshot=snap, _rsi_col=ind['RSI']),
             use_container_width=True
         )
 
     if indicators == 'MACD':
         st.plotly_chart(
-            macd_chart(full_data, selected_period),
+            macd_chart(full_data, selected_period, _snapshot=snap, _macd_cols=ind),
             use_container_width=True
         )
 
@@ -211,24 +245,24 @@ if chart_type == 'Line':
 
     if indicators == 'Moving Average':
         st.plotly_chart(
-            moving_average_chart(full_data, selected_period),
+            moving_average_chart(full_data, selected_period, _snapshot=snap, _ma_cols=ind),
             use_container_width=True
         )
 
     else:
         st.plotly_chart(
-            close_chart(full_data, selected_period),
+            close_chart(full_data, selected_period, _snapshot=snap),
             use_container_width=True
         )
 
         if indicators == 'RSI':
             st.plotly_chart(
-                rsi_chart(full_data, selected_period),
+                rsi_chart(full_data, selected_period, _snapshot=snap, _rsi_col=ind['RSI']),
                 use_container_width=True
             )
 
         if indicators == 'MACD':
             st.plotly_chart(
-                macd_chart(full_data, selected_period),
+                macd_chart(full_data, selected_period, _snapshot=snap, _macd_cols=ind),
                 use_container_width=True
             )
@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pages.utils.model_train import (
     get_data,
     get_rolling_mean,
+    get_52w_extrema,
     get_differencing_order,
     scaling,
     evaluate_model,
@@ -19,6 +21,20 @@ st.set_page_config(
     layout="wide",
 )
 
+# ── Background training ────────────────────────────────────────────────────────
+def get_executor():
+    # One pool per browser session: fits from different users run side by side
+    # instead of queueing on a shared process-wide pool
+    if "executor" not in st.session_state:
+        st.session_state["executor"] = ThreadPoolExecutor(max_workers=2)
+    return st.session_state["executor"]
+
+
+def train_and_forecast(scaled_data, d_order):
+    rmse, spec = evaluate_model(scaled_data, d_order)
+    forecast_df, conf_df, spec = get_forecast(scaled_data, d_order, spec=spec)
+    return rmse, forecast_df, conf_df, spec["order"]
+
 # ── Custom CSS ─────────────────────────────────────────────────────────────────
 st.markdown("""
 <style>
@@ -74,12 +90,14 @@ with st.spinner(f"Fetching data for **{ticker}** …"):
         st.error(f"Could not load data for **{ticker}**: {e}")
         st.stop()
 
+# Start ARIMA right away so the metrics below render while the model trains
+training = get_executor().submit(train_and_forecast, scaled_data, d_order)
+
 # ── Summary metrics row 1 ──────────────────────────────────────────────────────
 latest_close = float(raw_data["Close"].iloc[-1])
 prev_close   = float(raw_data["Close"].iloc[-2])
 pct_change   = (latest_close - prev_close) / prev_close * 100
-high_52w     = float(raw_data["Close"].tail(252).max())
-low_52w      = float(raw_data["Close"].tail(252).min())
+high_52w, low_52w = get_52w_extrema(raw_data["Close"].values)
 
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Latest Close",   f"${latest_close:,.2f}", f"{pct_change:+.2f}%")
@@ -91,11 +109,16 @@ col4.metric("Differencing d", str(d_order),
 st.markdown("---")
 st.subheader(f"30-Day Forecast — {ticker}")
 
+# Row 2 placeholders, filled in once the background fit finishes
+c1, c2, c3, c4 = (col.empty() for col in st.columns(4))
+for slot, label in zip((c1, c2, c3, c4),
+                       ("Model RMSE", "ARIMA Order", "Forecast End Price", "Projected 30d Return")):
+    slot.metric(label, "training…")
+
 # ── Model training ─────────────────────────────────────────────────────────────
 with st.spinner("Training ARIMA model …"):
     try:
-        rmse = evaluate_model(scaled_data, d_order)
-        forecast_df, conf_df, arima_order = get_forecast(scaled_data, d_order)
+        rmse, forecast_df, conf_df, arima_order = training.result()
 
         # Inverse-scale forecast and CI back to dollars
         forecast_df["Close"] = inverse_scaling(scaler, forecast_df["Close"]).flatten()
@@ -103,6 +126,8 @@ with st.spinner("Training ARIMA model …"):
         conf_df["Upper"]     = inverse_scaling(scaler, conf_df["Upper"]).flatten()
 
     except Exception as e:
+        for slot in (c1, c2, c3, c4):
+            slot.empty()
         st.error(f"Model training failed: {e}")
         st.stop()
 
@@ -111,7 +136,6 @@ price_range  = float(rolling_price["Close"].max() - rolling_price["Close"].min()
 rmse_dollars = rmse * price_range
 
 # ── Summary metrics row 2 ──────────────────────────────────────────────────────
-c1, c2, c3, c4 = st.columns(4)
 c1.metric(
     "Model RMSE",
     f"${rmse_dollars:,.2f}",
@@ -131,7 +155,7 @@ st.markdown("---")
 
 # ── Forecast table ─────────────────────────────────────────────────────────────
 with st.expander("📋 View Forecast Data Table", expanded=False):
-    display_df = forecast_df.copy().round(3)
+    display_df = forecast_df.round(3)
     display_df.index = display_df.index.strftime("%Y-%m-%d")
     display_df["Lower CI"] = conf_df["Lower"].round(3).values
     display_df["Upper CI"] = conf_df["Upper"].round(3).values
@@ -140,26 +164,20 @@ with st.expander("📋 View Forecast Data Table", expanded=False):
     st.plotly_chart(fig_table, use_container_width=True)
 
 # ── Forecast chart ─────────────────────────────────────────────────────────────
-# KEY FIX: rolling_price is in scaled (0-1) space — inverse-transform it back
-# to real dollar prices before concatenating with the already-unscaled forecast.
-hist_prices = inverse_scaling(scaler, scaled_data).flatten()
+# rolling_price is still in dollars; only the ARIMA input was scaled, so plot
+# it directly next to the already-unscaled forecast.
+hist_prices = rolling_price["Close"].to_numpy(dtype=np.float32)
 hist = pd.DataFrame(
     {"Close": hist_prices},
     index=pd.to_datetime(rolling_price.index).tz_localize(None),
 )
 
-# Align forecast + CI index timezone
-fcast = forecast_df[["Close"]].copy()
-fcast.index = pd.to_datetime(fcast.index).tz_localize(None)
-
-conf_aligned = conf_df.copy()
-conf_aligned.index = pd.to_datetime(conf_aligned.index).tz_localize(None)
-
+# Forecast + CI are already on a tz-naive business-day index, so no re-indexed copies
 # Full history + 30-day forecast — no truncation, range slider lets user zoom
-combined = pd.concat([hist, fcast])
+combined = pd.concat([hist, forecast_df[["Close"]]])
 
 st.plotly_chart(
-    Moving_average_forecast(combined, conf_aligned),
+    Moving_average_forecast(combined, conf_df),
     use_container_width=True,
 )
 
@@ -0,0 +1,150 @@
+import numpy as np
+
+from pages.utils._njit import njit
+
+
+# ==============================
+# SINGLE-PASS INDICATOR KERNELS  (float64 in, float64 out)
+# Each keeps only scalar running state, so one sweep over the array.
+# NaNs are skipped the way pandas rolling/ewm skip them, so one missing
+# Close doesn't poison everything after it.
+# ==============================
+
+@njit(cache=True)
+def _ema_step(s, w, x, alpha):
+    """
+    One ewm(adjust=False) update; `w` is the weight left on `s`.  A NaN `x`
+    only decays `w` and holds `s`, matching pandas' ignore_na=False.
+    Returns the new (s, w).
+    """
+    if np.isnan(s):                     # no observation yet
+        return x, 1.0
+    w *= 1.0 - alpha
+    if np.isnan(x):
+        return s, w
+    return (w * s + alpha * x) / (w + alpha), 1.0
+
+
+@njit(cache=True)
+def _rsi(close, n=14):
+    """Wilder RSI; same values as ewm(alpha=1/n, adjust=False) on gains/losses."""
+    out = np.full(close.size, np.nan)
+    alpha = 1.0 / n
+    avg_gain, w_gain = np.nan, 1.0
+    avg_loss, w_loss = np.nan, 1.0
+
+    for i in range(1, close.size):
+        delta = close[i] - close[i - 1]
+        if np.isnan(delta):
+            gain = loss = np.nan
+        else:
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+        avg_gain, w_gain = _ema_step(avg_gain, w_gain, gain, alpha)
+        avg_loss, w_loss = _ema_step(avg_loss, w_loss, loss, alpha)
+
+        if avg_loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0:
+            out[i] = 100.0
+    return out
+
+
+@njit(cache=True)
+def _sma(x, n):
+    """Rolling mean with min_periods=1: add the incoming value, drop the outgoing one."""
+    out = np.empty(x.size)
+    total = 0.0
+    count = 0
+
+    for i in range(x.size):
+        if not np.isnan(x[i]):
+            total += x[i]
+            count += 1
+        if i >= n and not np.isnan(x[i - n]):
+            total -= x[i - n]
+            count -= 1
+        out[i] = total / count if count > 0 else np.nan
+    return out
+
+
+@njit(cache=True)
+def _ema(x, n):
+    """ewm(span=n, adjust=False): s = alpha * x + (1 - alpha) * s."""
+    out = np.empty(x.size)
+    alpha = 2.0 / (n + 1)
+    s, w = np.nan, 1.0
+
+    for i in range(x.size):
+        s, w = _ema_step(s, w, x[i], alpha)
+        out[i] = s
+    return out
+
+
+@njit(cache=True)
+def _macd_fused(close, fast=12, slow=26, signal=9):
+    """MACD line, signal, histogram and histogram sign from one sweep over close."""
+    n = close.size
+    macd = np.empty(n)
+    sig  = np.empty(n)
+    hist = np.empty(n)
+    up   = np.empty(n, dtype=np.bool_)
+
+    a_fast = 2.0 / (fast + 1)
+    a_slow = 2.0 / (slow + 1)
+    a_sig  = 2.0 / (signal + 1)
+    ema_fast, w_fast = np.nan, 1.0
+    ema_slow, w_slow = np.nan, 1.0
+    s, w_sig = np.nan, 1.0
+
+    for i in range(n):
+        ema_fast, w_fast = _ema_step(ema_fast, w_fast, close[i], a_fast)
+        ema_slow, w_slow = _ema_step(ema_slow, w_slow, close[i], a_slow)
+        m = ema_fast - ema_slow
+        s, w_sig = _ema_step(s, w_sig, m, a_sig)
+
+        macd[i] = m
+        sig[i]  = s
+        hist[i] = m - s
+        up[i]   = hist[i] >= 0
+    return macd, sig, hist, up
+
+
+# ==============================
+# LTTB DOWNSAMPLING KERNEL
+# ==============================
+
+@njit(cache=True)
+def _lttb(x, y, edges):
+    """
+    Largest-Triangle-Three-Buckets over NaN-free float64 x/y.  `edges` holds the
+    bucket boundaries; returns the kept indices (first and last always included).
+    """
+    n = y.size
+    target = edges.size + 1
+    keep = np.empty(target, dtype=np.int64)
+    keep[0], keep[target - 1] = 0, n - 1
+
+    a = 0
+    for i in range(target - 2):
+        lo, hi  = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < edges.size else n
+
+        # Average of the next bucket is the triangle's third vertex
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(hi, next_hi):
+            avg_x += x[j]
+            avg_y += y[j]
+        avg_x /= next_hi - hi
+        avg_y /= next_hi - hi
+
+        best, best_j = -1.0, lo
+        for j in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best:
+                best, best_j = area, j
+        a = best_j
+        keep[i + 1] = a
+    return keep
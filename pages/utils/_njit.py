@@ -0,0 +1,10 @@
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:        # kernels still import; callers use the pandas versions instead
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
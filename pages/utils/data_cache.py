@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import date
+
+import pandas as pd
+import yfinance as yf
+
+
+# ==============================
+# DISK CACHE  (.cache/{ticker}/{md5}.parquet)
+# ==============================
+
+CACHE_DIR      = ".cache"
+RECENT_TTL     = 24 * 3600          # ranges touching today refresh daily
+HISTORICAL_TTL = 90 * 24 * 3600     # closed ranges practically never change
+
+_SAFE_TICKER = re.compile(r"[A-Z0-9^][A-Z0-9.^=-]*")   # e.g. BRK.B, ^GSPC, EURUSD=X
+
+_TICKERS: dict = {}
+
+
+def get_ticker(symbol: str) -> yf.Ticker:
+    """Return a memoized yf.Ticker so repeated lookups reuse one session."""
+    ticker = _TICKERS.get(symbol)
+    if ticker is None:
+        ticker = _TICKERS[symbol] = yf.Ticker(symbol)
+    return ticker
+
+
+def _cache_path(ticker: str, key: str, ext: str) -> str:
+    # Tickers are user input: anything that isn't a plain symbol is hashed so it
+    # can never name a path outside CACHE_DIR
+    name   = ticker if _SAFE_TICKER.fullmatch(ticker) else hashlib.md5(ticker.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, name, f"{key}.{ext}")
+
+
+def _atomic_write(path: str, write) -> None:
+    """write(tmp_path) then rename over `path`, so readers never see a partial file."""
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)      # only once there is something to store
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _is_fresh(path: str, ttl: float) -> bool:
+    return os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl
+
+
+def _ttl_for(end) -> float:
+    if end is not None and pd.Timestamp(end).date() < date.today():
+        return HISTORICAL_TTL
+    return RECENT_TTL
+
+
+def _read_or_fetch(path: str, ttl: float, fetch) -> pd.DataFrame:
+    if _is_fresh(path, ttl):
+        return pd.read_parquet(path)
+
+    data = fetch()
+    if not data.empty:                  # never cache a failed lookup
+        _atomic_write(path, data.to_parquet)
+    return data
+
+
+def cached_download(ticker: str, start, end=None) -> pd.DataFrame:
+    """yf.download() backed by a parquet file keyed on ticker + date range."""
+    key  = hashlib.md5(f"{ticker}|{start}|{end}".encode()).hexdigest()
+    path = _cache_path(ticker, key, "parquet")
+
+    def fetch():
+        data = yf.download(ticker, start=start, end=end, auto_adjust=True, progress=False)
+        # Single-ticker downloads come back with a (Price, Ticker) column MultiIndex
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        return data
+
+    return _read_or_fetch(path, _ttl_for(end), fetch)
+
+
+def cached_history(ticker: str, period: str = "max") -> pd.DataFrame:
+    """Ticker.history() backed by a parquet file refreshed daily."""
+    path = _cache_path(ticker, f"history-{period}", "parquet")
+    return _read_or_fetch(path, RECENT_TTL, lambda: get_ticker(ticker).history(period=period))
+
+
+def cached_info(ticker: str) -> dict:
+    """Ticker.get_info() backed by a JSON file refreshed daily."""
+    path = _cache_path(ticker, "info", "json")
+
+    if _is_fresh(path, RECENT_TTL):
+        with open(path) as f:
+            return json.load(f)
+
+    info = get_ticker(ticker).get_info()
+    if info:
+        def write(tmp):
+            with open(tmp, "w") as f:
+                json.dump(info, f, default=str)
+        _atomic_write(path, write)
+    return info
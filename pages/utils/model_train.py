@@ -1,13 +1,21 @@
-import yfinance as yf
+import streamlit as st
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from collections import deque
+from functools import lru_cache
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.tsa.arima.model import ARIMA
 from sklearn.metrics import mean_squared_error
-from sklearn.preprocessing import MinMaxScaler
+from joblib import Parallel, delayed
 import warnings
 
+try:
+    from statsforecast.models import AutoARIMA, ARIMA as StatsForecastARIMA
+except ImportError:        # fall back to the statsmodels grid search below
+    AutoARIMA = StatsForecastARIMA = None
+
+from pages.utils.data_cache import cached_download
+
 warnings.filterwarnings("ignore")
 
 
@@ -15,9 +23,10 @@ warnings.filterwarnings("ignore")
 # DATA
 # ==============================
 
+@st.cache_data(ttl=3600)
 def get_data(ticker: str) -> pd.DataFrame:
-    """Download OHLCV data and return the Close series."""
-    stock_data = yf.download(ticker, start="2022-01-01", auto_adjust=True, progress=False)
+    """Download OHLCV data (disk-cached) and return the Close series."""
+    stock_data = cached_download(ticker, start="2022-01-01")
     return stock_data[["Close"]]
 
 
@@ -25,14 +34,22 @@ def get_data(ticker: str) -> pd.DataFrame:
 # STATIONARITY
 # ==============================
 
+@lru_cache(maxsize=128)
+def _adf_cached(key: bytes, n: int) -> float:
+    """ADF p-value memoized on the raw series bytes, shared across reruns."""
+    series = np.frombuffer(key, dtype=np.float64)[:n].copy()
+    maxlag = int(np.ceil(12 * (n / 100) ** 0.25))     # Schwert's rule, fixed: no AIC lag search
+    return adfuller(series, maxlag=maxlag, autolag=None)[1]
+
+
 def stationary_check(close_price: pd.Series) -> float:
-    result = adfuller(close_price.dropna())
-    return round(result[1], 4)
+    values = close_price.dropna().to_numpy(dtype=np.float64)
+    return round(_adf_cached(values.tobytes(), len(values)), 4)
 
 
 def get_differencing_order(close_price: pd.Series) -> int:
     """Return the minimum differencing order d that makes the series stationary."""
-    series = close_price.copy().dropna()
+    series = close_price.dropna()
     d = 0
     for _ in range(3):  # cap at 3 differences
         if stationary_check(series) <= 0.05:
@@ -47,9 +64,39 @@ def get_differencing_order(close_price: pd.Series) -> int:
 # ==============================
 
 def get_rolling_mean(close_price: pd.DataFrame, window: int = 7) -> pd.DataFrame:
-    """Smooth the Close column with a rolling mean to reduce noise."""
-    smoothed = close_price.rolling(window=window, min_periods=1).mean().dropna()
-    return smoothed
+    """Smooth the Close column with a rolling mean (prefix sums) to reduce noise."""
+    close_price = close_price.dropna()
+    cs = np.cumsum(close_price.to_numpy(dtype=np.float64), axis=0)
+
+    means = np.empty_like(cs)
+    head  = min(window, len(cs))            # min_periods=1: average what we have
+    means[:head]   = cs[:head] / np.arange(1, head + 1)[:, None]
+    means[window:] = (cs[window:] - cs[:-window]) / window
+
+    return pd.DataFrame(means, index=close_price.index, columns=close_price.columns)
+
+
+def get_52w_extrema(close: np.ndarray, window: int = 252) -> tuple[float, float]:
+    """
+    Rolling max/min over the last `window` bars using monotonic deques,
+    so each new bar costs amortized O(1).  Returns (high, low).
+    """
+    highs, lows = deque(), deque()          # indices; values decreasing / increasing
+
+    for i, price in enumerate(close):
+        while highs and close[highs[-1]] <= price:
+            highs.pop()
+        while lows and close[lows[-1]] >= price:
+            lows.pop()
+        highs.append(i)
+        lows.append(i)
+
+        if highs[0] <= i - window:
+            highs.popleft()
+        if lows[0] <= i - window:
+            lows.popleft()
+
+    return float(close[highs[0]]), float(close[lows[0]])
 
 
 # ==============================
@@ -57,55 +104,90 @@ def get_rolling_mean(close_price: pd.DataFrame, window: int = 7) -> pd.DataFrame
 # ==============================
 
 def scaling(close_price: pd.DataFrame):
-    scaler = MinMaxScaler(feature_range=(0, 1))
-    scaled = scaler.fit_transform(np.array(close_price).reshape(-1, 1))
-    return scaled, scaler
+    """Min-max scale to [0, 1]; the "scaler" is just the (min, max) pair."""
+    x = np.asarray(close_price, dtype=np.float64).ravel()
+    lo, hi = float(np.nanmin(x)), float(np.nanmax(x))
+    scaled = ((x - lo) / ((hi - lo) or 1.0)).astype(np.float32)
+    return scaled, (lo, hi)
 
 
 def inverse_scaling(scaler, scaled_data):
-    return scaler.inverse_transform(np.array(scaled_data).reshape(-1, 1))
+    lo, hi = scaler
+    return np.asarray(scaled_data, dtype=np.float64) * ((hi - lo) or 1.0) + lo
 
 
 # ==============================
 # AUTO ORDER SELECTION  (AIC grid search over small p/q grid)
+# Only used when statsforecast is not installed.
 # ==============================
 
+def _fit_one(data: np.ndarray, order: tuple):
+    try:
+        return ARIMA(data, order=order).fit().aic, order
+    except Exception:
+        return np.inf, None
+
+
 def _best_arima_order(data: np.ndarray, d: int):
     """
-    Grid-search over p in {5,10,15,20} and q in {0,5,10} and return the
+    Grid-search over p in {5,10,20} and q in {0,5,10} and return the
     (p, d, q) tuple with the lowest AIC.  Falls back to (20, d, 10) on error.
+    The fits are independent, so they run across all cores.
     """
-    best_aic = np.inf
-    best_order = (20, d, 10)
-
-    p_candidates = [5, 10, 20]
-    q_candidates = [0, 5, 10]
+    grid = [(p, d, q) for p in [5, 10, 20] for q in [0, 5, 10]]
 
-    for p in p_candidates:
-        for q in q_candidates:
-            try:
-                m = ARIMA(data, order=(p, d, q))
-                res = m.fit()
-                if res.aic < best_aic:
-                    best_aic = res.aic
-                    best_order = (p, d, q)
-            except Exception:
-                continue
+    results = Parallel(n_jobs=-1, backend="loky")(
+        delayed(_fit_one)(data, order) for order in grid
+    )
 
-    return best_order
+    best_aic, best_order = min(results, key=lambda r: r[0])
+    return best_order if best_order is not None else (20, d, 10)
 
 
 # ==============================
 # MODEL FIT & FORECAST
 # ==============================
 
-def fit_model(data, differencing_order: int, steps: int = 30):
+def _fit_auto_arima(flat: np.ndarray, differencing_order: int, steps: int, spec=None):
+    """Stepwise (Hyndman-Khandakar) search + forecast in statsforecast's Numba kernels."""
+    if spec is None:
+        model = AutoARIMA(
+            d=differencing_order, max_p=20, max_q=10,
+            stepwise=True, approximation=False, season_length=1,
+        )
+    else:
+        model = StatsForecastARIMA(
+            order=spec["order"], season_length=1,
+            include_mean=spec["include_mean"], include_drift=spec["include_drift"],
+        )
+    model.fit(flat)
+    fc = model.predict(h=steps, level=[95])
+
+    arma = model.model_["arma"]         # (p, q, P, Q, m, d, D)
+    coef = model.model_["coef"]
+    spec = dict(
+        order=(arma[0], arma[5], arma[1]),
+        include_mean="intercept" in coef,
+        include_drift="drift" in coef,
+    )
+
+    conf_int = np.column_stack([fc["lo-95"], fc["hi-95"]])
+    return fc["mean"], conf_int, spec
+
+
+def fit_model(data, differencing_order: int, steps: int = 30, spec=None):
     """
-    Fit an ARIMA model with auto-selected order and return forecast values.
-    Also returns a (lower, upper) 95 % confidence interval tuple.
+    Fit an ARIMA model and return forecast values.
+    Also returns a (lower, upper) 95 % confidence interval tuple and the model
+    spec (a dict with the (p, d, q) 'order', plus statsforecast's mean/drift
+    flags).  The model is auto-selected unless a `spec` is passed in.
     """
-    flat = np.array(data).flatten()
-    order = _best_arima_order(flat, differencing_order)
+    flat = np.array(data, dtype=np.float64).flatten()
+
+    if AutoARIMA is not None:
+        return _fit_auto_arima(flat, differencing_order, steps, spec)
+
+    order = spec["order"] if spec is not None else _best_arima_order(flat, differencing_order)
 
     model     = ARIMA(flat, order=order)
     model_fit = model.fit()
@@ -114,37 +196,41 @@ def fit_model(data, differencing_order: int, steps: int = 30):
     predictions  = forecast_obj.predicted_mean
     conf_int     = forecast_obj.conf_int(alpha=0.05)   # 95 % CI
 
-    return predictions, conf_int, order
+    return predictions, conf_int, dict(order=order)
 
 
-def evaluate_model(original_price, differencing_order: int) -> float:
-    """Walk-forward RMSE on the last 30 scaled observations."""
+def evaluate_model(original_price, differencing_order: int) -> tuple[float, dict]:
+    """
+    Walk-forward RMSE on the last 30 scaled observations.
+    Also returns the chosen model spec so the final forecast refits the same
+    model (order and mean/drift terms) instead of searching again.
+    """
     train, test = original_price[:-30], original_price[-30:]
-    preds, _, _ = fit_model(train, differencing_order, steps=30)
+    preds, _, spec = fit_model(train, differencing_order, steps=30)
     rmse = float(np.sqrt(mean_squared_error(test, preds)))
-    return round(rmse, 4)
+    return round(rmse, 4), spec
 
 
 # ==============================
 # FORECAST DATAFRAME
 # ==============================
 
-def get_forecast(original_price, differencing_order: int) -> tuple[pd.DataFrame, pd.DataFrame, tuple]:
+def get_forecast(original_price, differencing_order: int, spec=None) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
     """
+    Pass the `spec` returned by evaluate_model() to reuse that model instead of searching again.
+
     Returns:
         forecast_df  – DataFrame with columns ['Close'] indexed by future dates
         conf_df      – DataFrame with columns ['Lower', 'Upper'] for the CI
-        order        – the chosen ARIMA (p,d,q) order
+        spec         – the fitted model spec; spec['order'] is the ARIMA (p,d,q)
     """
     steps = 30
-    predictions, conf_int, order = fit_model(original_price, differencing_order, steps=steps)
-
-    # Build daily date index starting tomorrow
-    start_date    = datetime.now() + timedelta(days=1)
-    forecast_index = pd.date_range(start=start_date, periods=steps, freq="B")   # business days
+    predictions, conf_int, spec = fit_model(original_price, differencing_order, steps=steps, spec=spec)
 
-    # Pad or trim if freq="B" gives a different length
-    forecast_index = forecast_index[:len(predictions)]
+    # Business-day index starting tomorrow (rolled forward off weekends)
+    tomorrow       = np.datetime64("today", "D") + 1
+    forecast_days  = np.busday_offset(tomorrow, np.arange(len(predictions)), roll="forward")
+    forecast_index = pd.DatetimeIndex(forecast_days)
 
     forecast_df = pd.DataFrame({"Close": predictions}, index=forecast_index)
 
@@ -153,4 +239,4 @@ def get_forecast(original_price, differencing_order: int) -> tuple[pd.DataFrame,
         index=forecast_index,
     )
 
-    return forecast_df, conf_df, order
\ No newline at end of file
+    return forecast_df, conf_df, spec
\ No newline at end of file
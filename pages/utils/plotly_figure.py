@@ -1,10 +1,17 @@
+import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
+import numpy as np
 from dateutil.relativedelta import relativedelta
-import datetime
-import pandas_ta as pta
+
+from pages.utils import _indicators_numba as nb
+from pages.utils._njit import NUMBA_AVAILABLE
+
+try:
+    import bottleneck as bn
+except ImportError:        # _sma falls back to the Numba kernel / pandas rolling
+    bn = None
 
 # ==============================
 # DESIGN TOKENS
@@ -51,22 +58,27 @@ COMMON_LAYOUT = dict(
     ),
 )
 
+# Shared per-chart fragments, built once instead of on every render
+_RANGESLIDER = dict(rangeslider_visible=True, rangeslider=dict(bgcolor=PALETTE["bg_card2"], thickness=0.06))
+_LEGEND_TOP  = dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1)
+_LEGEND_SUB  = dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+_HOVER       = {
+    col: f"<b>{col}</b>: %{{y:.2f}}<extra></extra>"
+    for col in ("Open", "High", "Low", "Close", "SMA_20", "SMA_50", "EMA_12")
+}
+
 
 # ==============================
 # TABLE
 # ==============================
 
 def plotly_table(dataframe: pd.DataFrame):
-    dataframe = dataframe.copy()
-
     header_color  = PALETTE["bg_card2"]
     row_odd_color = PALETTE["bg_dark"]
     row_even_color= PALETTE["bg_card"]
 
-    row_colors = [
-        row_odd_color if i % 2 == 0 else row_even_color
-        for i in range(len(dataframe))
-    ]
+    row_colors = np.where(np.arange(len(dataframe)) & 1, row_even_color, row_odd_color).tolist()
+    row_labels = ("<b>" + dataframe.index.astype(str) + "</b>").tolist()
 
     fig = go.Figure(data=[go.Table(
         header=dict(
@@ -78,9 +90,7 @@ def plotly_table(dataframe: pd.DataFrame):
             height=38,
         ),
         cells=dict(
-            values=[
-                [f"<b>{str(i)}</b>" for i in dataframe.index]
-            ] + [dataframe[col] for col in dataframe.columns],
+            values=[row_labels] + [dataframe[col] for col in dataframe.columns],
             fill_color=[row_colors] * (len(dataframe.columns) + 1),
             align="left",
             line_color=PALETTE["border"],
@@ -98,57 +108,287 @@ def plotly_table(dataframe: pd.DataFrame):
 
 
 # ==============================
-# DATA FILTER
+# PERIOD WINDOW HELPERS
 # ==============================
 
-def filter_data(dataframe: pd.DataFrame, num_period: str):
-    df = dataframe.copy().sort_index()
-    last_date = df.index[-1]
-
+def _period_start(last_date: pd.Timestamp, num_period: str):
     period_map = {
         "5d":  lambda: last_date - relativedelta(days=5),
         "1mo": lambda: last_date - relativedelta(months=1),
         "6mo": lambda: last_date - relativedelta(months=6),
         "1y":  lambda: last_date - relativedelta(years=1),
         "5y":  lambda: last_date - relativedelta(years=5),
-        "ytd": lambda: datetime.datetime(last_date.year, 1, 1),
+        "ytd": lambda: pd.Timestamp(year=last_date.year, month=1, day=1, tz=last_date.tz),
     }
+    return period_map[num_period]() if num_period in period_map else None
+
+
+def _sorted(dataframe: pd.DataFrame) -> pd.DataFrame:
+    return dataframe if dataframe.index.is_monotonic_increasing else dataframe.sort_index()
 
-    if num_period in period_map:
-        start_date = period_map[num_period]()
-        df = df[df.index >= start_date]
 
-    return df.reset_index()
+def _dates(dates) -> np.ndarray:
+    """datetime64 values (tz dropped) so Plotly gets a typed buffer, not Timestamps."""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy()
+
+
+def _f32(values) -> np.ndarray:
+    """Prices/indicators as float32: Plotly base64-encodes it at 4 bytes a value."""
+    return np.asarray(values, dtype=np.float32)
 
 
 # ==============================
-# CLOSE CHART
+# OHLC SNAPSHOT  (struct of arrays)
+# Built once per symbol; every chart slices it with two searchsorted calls.
 # ==============================
 
-def close_chart(dataframe: pd.DataFrame, num_period: str = None):
-    df = dataframe.copy()
-    df = filter_data(df, num_period) if num_period else df.reset_index()
+OHLC_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
 
-    fig = go.Figure()
 
-    traces = [
+def ohlc_snapshot(dataframe: pd.DataFrame) -> dict[str, np.ndarray]:
+    """float32 OHLCV columns plus the dates as datetime64 and epoch seconds."""
+    df    = _sorted(dataframe)
+    dates = _dates(df.index)
+
+    snap = {col: _f32(df[col]) for col in OHLC_COLUMNS}
+    snap["Date"] = dates
+    snap["t"]    = dates.astype("datetime64[s]").astype(np.int64)
+    return snap
+
+
+def _window_bounds(snap: dict, num_period: str) -> tuple[int, int]:
+    start_date = _period_start(pd.Timestamp(snap["Date"][-1]), num_period)
+    if start_date is None:
+        return 0, len(snap["t"])
+    return int(np.searchsorted(snap["t"], start_date.value // 10**9)), len(snap["t"])
+
+
+DOWNSAMPLE_TARGET = 1500     # ~1 point per horizontal pixel
+
+
+def _downsample(arrays: dict, target: int = DOWNSAMPLE_TARGET) -> dict:
+    """
+    Bucket arrays down to `target` points, keeping each bucket's OHLC shape exact.
+    Each point is dated at its bucket's last row, where Close and the indicators are read.
+    """
+    edges  = np.linspace(0, len(arrays["Date"]), target + 1).astype(int)
+    starts = edges[:-1]
+    lasts  = edges[1:] - 1
+
+    out = {}
+    for col, values in arrays.items():
+        if col == "High":
+            out[col] = np.maximum.reduceat(values, starts)
+        elif col == "Low":
+            out[col] = np.minimum.reduceat(values, starts)
+        elif col == "Volume":
+            out[col] = np.add.reduceat(values, starts)
+        elif col == "Open":
+            out[col] = values[starts]
+        else:                                 # Date, Close and indicators: bucket's last row
+            out[col] = values[lasts]
+    return out
+
+
+def _lttb(x: np.ndarray, y: np.ndarray, target: int = DOWNSAMPLE_TARGET) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `target` points that keep a single
+    line's visual shape (peaks and troughs survive, unlike last-in-bucket).
+    Prepares NaN-free inputs here; the bucket loop runs in the Numba kernel.
+    """
+    n = len(y)
+    if n <= target:
+        return np.arange(n)
+
+    xf    = x.astype(np.int64).astype(np.float64)      # datetime64 -> ns ticks
+    edges = np.linspace(1, n - 1, target - 1).astype(int)
+
+    # Score on a gap-free copy; NaN points can still be picked and plot as gaps
+    y    = y.astype(np.float64)
+    gaps = np.isnan(y)
+    if gaps.all():
+        return edges[:-1]
+    if gaps.any():
+        idx = np.arange(n)
+        y[gaps] = np.interp(idx[gaps], idx[~gaps], y[~gaps])
+
+    if NUMBA_AVAILABLE:
+        return nb._lttb(xf, y, edges)
+    return _lttb_numpy(xf, y, edges)
+
+
+def _lttb_numpy(xf: np.ndarray, y: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Same bucket loop as nb._lttb, vectorised per bucket for when numba is missing."""
+    n      = len(y)
+    target = len(edges) + 1
+
+    keep = np.empty(target, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        lo, hi   = edges[i], edges[i + 1]
+        next_hi  = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x    = xf[hi:next_hi].mean()
+        avg_y    = y[hi:next_hi].mean()
+        area     = np.abs((xf[a] - avg_x) * (y[lo:hi] - y[a]) - (xf[a] - xf[lo:hi]) * (avg_y - y[a]))
+        a        = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _window(snap: dict, num_period: str, downsample: bool = True, **indicators) -> dict[str, np.ndarray]:
+    """
+    Slice the snapshot (plus full-length indicator arrays) to the period, bucket-
+    downsampled.  Line-only charts pass downsample=False and thin each trace with _line().
+    """
+    lo, hi = _window_bounds(snap, num_period)
+
+    arrays = {col: values[lo:hi] for col, values in snap.items()}
+    arrays.update({col: _f32(values[lo:hi]) for col, values in indicators.items()})
+
+    return _downsample(arrays) if downsample and hi - lo > DOWNSAMPLE_TARGET else arrays
+
+
+def _line(arrays: dict, col: str) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) for one line trace, LTTB-thinned so its peaks survive long windows."""
+    if len(arrays[col]) <= DOWNSAMPLE_TARGET:
+        return arrays["Date"], arrays[col]
+    keep = _lttb(arrays["Date"], arrays[col])
+    return arrays["Date"][keep], arrays[col][keep]
+
+
+# ==============================
+# INDICATORS  (Wilder RSI / MACD / SMA / EMA: Numba kernels when
+# numba is installed, pandas rolling + ewm otherwise; SMA via bottleneck
+# when available)
+# Computed together and cached on the raw Close bytes, so toggling chart
+# type, indicator or period reuses the previous computation (last 32 series).
+# ==============================
+
+def _close_bytes(snap: dict) -> bytes:
+    return snap["Close"].tobytes()
+
+
+def _close_series(close_bytes: bytes) -> pd.Series:
+    return pd.Series(np.frombuffer(close_bytes, dtype=np.float32), dtype=np.float64)
+
+
+def _rsi(close: pd.Series, length: int = 14) -> pd.Series:
+    delta    = close.diff()
+    avg_gain = delta.clip(lower=0).ewm(alpha=1 / length, adjust=False).mean()
+    avg_loss = (-delta.clip(upper=0)).ewm(alpha=1 / length, adjust=False).mean()
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _sma(x: np.ndarray, length: int) -> np.ndarray:
+    """Rolling mean with min_periods=1."""
+    if bn is not None:
+        return bn.move_mean(x, window=length, min_count=1)
+    if NUMBA_AVAILABLE:
+        return nb._sma(x, length)
+    return pd.Series(x).rolling(length, min_periods=1).mean().to_numpy()
+
+
+def _macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9):
+    macd = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    sig  = macd.ewm(span=signal, adjust=False).mean()
+    return macd, sig, macd - sig
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_indicators(close_bytes: bytes) -> dict[str, np.ndarray]:
+    """Every indicator the charts draw, computed together once per Close series."""
+    close = _close_series(close_bytes)
+    x     = close.to_numpy()
+
+    if NUMBA_AVAILABLE:
+        macd, sig, hist, up = nb._macd_fused(x)
+        return {
+            "RSI":         nb._rsi(x, 14),
+            "MACD":        macd,
+            "MACD_Signal": sig,
+            "MACD_Hist":   hist,
+            "MACD_Up":     up,
+            "SMA_20":      _sma(x, 20),
+            "SMA_50":      _sma(x, 50),
+            "EMA_12":      nb._ema(x, 12),
+        }
+
+    macd, signal, hist = _macd(close)
+    return {
+        "RSI":         _rsi(close).to_numpy(),
+        "MACD":        macd.to_numpy(),
+        "MACD_Signal": signal.to_numpy(),
+        "MACD_Hist":   hist.to_numpy(),
+        "MACD_Up":     (hist >= 0).to_numpy(),
+        "SMA_20":      _sma(x, 20),
+        "SMA_50":      _sma(x, 50),
+        "EMA_12":      close.ewm(span=12, adjust=False).mean().to_numpy(),
+    }
+
+
+def snapshot_indicators(snapshot: dict) -> dict[str, np.ndarray]:
+    """compute_indicators() for a snapshot, so a page can compute once and share."""
+    return compute_indicators(_close_bytes(snapshot))
+
+
+# ==============================
+# FIGURE CACHE
+# Charts are pure functions of (frame, period); reruns reuse the built figure.
+# Precomputed inputs (`_snapshot`, indicator arrays) are derived from the frame,
+# so their underscore names keep them out of the key.
+# In the browser, a per-(chart, period) `uirevision` and stable trace `uid`s let
+# plotly.js keep zoom/legend state and update traces in place across reruns.
+# ==============================
+
+def _frame_key(dataframe: pd.DataFrame) -> tuple:
+    """Cheap identity for a price frame: shape, date span and last row."""
+    if dataframe.empty:
+        return (tuple(dataframe.columns),)
+    return (
+        tuple(dataframe.columns), len(dataframe),
+        dataframe.index[0], dataframe.index[-1],
+        dataframe.iloc[-1].to_numpy().tobytes(),
+    )
+
+
+_FIGURE_CACHE = dict(max_entries=32, show_spinner=False, hash_funcs={pd.DataFrame: _frame_key})
+
+
+# ==============================
+# CLOSE CHART
+# ==============================
+
+@st.cache_data(**_FIGURE_CACHE)
+def close_chart(dataframe: pd.DataFrame, num_period: str = None, _snapshot: dict = None):
+    arrays = _window(_snapshot or ohlc_snapshot(dataframe), num_period, downsample=False)
+    xy     = {col: _line(arrays, col) for col in ("High", "Low", "Open", "Close")}
+
+    lines = [
         ("High",  PALETTE["accent_blue"],   dict(width=1.5)),
         ("Low",   PALETTE["accent_red"],    dict(width=1.5)),
         ("Open",  PALETTE["text_muted"],    dict(width=1.5, dash="dot")),
         ("Close", PALETTE["accent_cyan"],   dict(width=2.5)),
     ]
 
-    for col, color, line_style in traces:
-        fig.add_trace(go.Scatter(
-            x=df["Date"], y=df[col],
+    traces = [
+        go.Scattergl(
+            uid=f"close-{col}",
+            x=xy[col][0], y=xy[col][1],
             mode="lines", name=col,
             line=dict(color=color, **line_style),
-            hovertemplate=f"<b>{col}</b>: %{{y:.2f}}<extra></extra>",
-        ))
+            hovertemplate=_HOVER[col],
+        )
+        for col, color, line_style in lines
+    ]
 
     # Shaded area under Close
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["Close"],
+    traces.append(go.Scattergl(
+        uid="close-area",
+        x=xy["Close"][0], y=xy["Close"][1],
         fill="tozeroy",
         fillcolor="rgba(57,208,224,0.05)",
         line=dict(width=0),
@@ -156,9 +396,10 @@ def close_chart(dataframe: pd.DataFrame, num_period: str = None):
         hoverinfo="skip",
     ))
 
-    fig.update_xaxes(rangeslider_visible=True, rangeslider=dict(bgcolor=PALETTE["bg_card2"], thickness=0.06))
-    fig.update_layout(height=520, **COMMON_LAYOUT)
-    fig.update_layout(legend=dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1))
+    fig = go.Figure(data=traces)
+    fig.update_xaxes(**_RANGESLIDER)
+    fig.update_layout(height=520, uirevision=f"close-{num_period}", **COMMON_LAYOUT)
+    fig.update_layout(legend=_LEGEND_TOP)
     return fig
 
 
@@ -166,19 +407,20 @@ def close_chart(dataframe: pd.DataFrame, num_period: str = None):
 # CANDLESTICK
 # ==============================
 
-def candlestick_chart(dataframe: pd.DataFrame, num_period: str):
-    df = filter_data(dataframe, num_period)
+@st.cache_data(**_FIGURE_CACHE)
+def candlestick_chart(dataframe: pd.DataFrame, num_period: str, _snapshot: dict = None):
+    arrays = _window(_snapshot or ohlc_snapshot(dataframe), num_period)
 
-    fig = go.Figure()
-    fig.add_trace(go.Candlestick(
-        x=df["Date"],
-        open=df["Open"], high=df["High"], low=df["Low"], close=df["Close"],
+    fig = go.Figure(data=[go.Candlestick(
+        uid="candle-ohlc",
+        x=arrays["Date"],
+        open=arrays["Open"], high=arrays["High"], low=arrays["Low"], close=arrays["Close"],
         increasing=dict(line=dict(color=PALETTE["accent_green"]), fillcolor=PALETTE["accent_green"]),
         decreasing=dict(line=dict(color=PALETTE["accent_red"]),   fillcolor=PALETTE["accent_red"]),
-    ))
+    )])
 
     fig.update_xaxes(rangeslider_visible=False)
-    fig.update_layout(showlegend=False, height=520, **COMMON_LAYOUT)
+    fig.update_layout(showlegend=False, height=520, uirevision=f"candle-{num_period}", **COMMON_LAYOUT)
     return fig
 
 
@@ -186,35 +428,37 @@ def candlestick_chart(dataframe: pd.DataFrame, num_period: str):
 # RSI
 # ==============================
 
-def rsi_chart(dataframe: pd.DataFrame, num_period: str):
-    df = dataframe.copy()
-    df["RSI"] = pta.rsi(df["Close"])
-    df = filter_data(df, num_period)
+@st.cache_data(**_FIGURE_CACHE)
+def rsi_chart(dataframe: pd.DataFrame, num_period: str, _snapshot: dict = None, *, _rsi_col: np.ndarray = None):
+    snap   = _snapshot or ohlc_snapshot(dataframe)
+    rsi    = _rsi_col if _rsi_col is not None else compute_indicators(_close_bytes(snap))["RSI"]
+    x, y   = _line(_window(snap, num_period, downsample=False, RSI=rsi), "RSI")
 
-    fig = go.Figure()
+    fig = go.Figure(data=[go.Scattergl(
+        uid="rsi-RSI",
+        x=x, y=y,
+        name="RSI", line=dict(width=2, color=PALETTE["accent_gold"]),
+        hovertemplate="<b>RSI</b>: %{y:.1f}<extra></extra>",
+    )])
 
     # Overbought / oversold bands
     fig.add_hrect(y0=70, y1=100, fillcolor="rgba(248,81,73,0.08)",  line_width=0)
     fig.add_hrect(y0=0,  y1=30,  fillcolor="rgba(63,185,80,0.08)", line_width=0)
 
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=[70]*len(df),
-        name="Overbought", line=dict(width=1, color=PALETTE["accent_red"], dash="dash"),
-        hoverinfo="skip",
-    ))
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=[30]*len(df),
-        name="Oversold", line=dict(width=1, color=PALETTE["accent_green"], dash="dash"),
-        hoverinfo="skip",
-    ))
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["RSI"],
-        name="RSI", line=dict(width=2, color=PALETTE["accent_gold"]),
-        hovertemplate="<b>RSI</b>: %{y:.1f}<extra></extra>",
-    ))
+    # Threshold lines are single shapes, not N-point traces
+    fig.add_hline(
+        y=70, line=dict(width=1, color=PALETTE["accent_red"], dash="dash"),
+        annotation_text="Overbought", annotation_position="top right",
+        annotation_font=dict(color=PALETTE["accent_red"], size=10),
+    )
+    fig.add_hline(
+        y=30, line=dict(width=1, color=PALETTE["accent_green"], dash="dash"),
+        annotation_text="Oversold", annotation_position="bottom right",
+        annotation_font=dict(color=PALETTE["accent_green"], size=10),
+    )
 
-    fig.update_layout(yaxis_range=[0, 100], height=220, **COMMON_LAYOUT)
-    fig.update_layout(legend=dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    fig.update_layout(yaxis_range=[0, 100], height=220, uirevision=f"rsi-{num_period}", **COMMON_LAYOUT)
+    fig.update_layout(legend=_LEGEND_SUB)
     return fig
 
 
@@ -222,14 +466,11 @@ def rsi_chart(dataframe: pd.DataFrame, num_period: str):
 # MOVING AVERAGE
 # ==============================
 
-def moving_average_chart(dataframe: pd.DataFrame, num_period: str):
-    df = dataframe.copy()
-    df["SMA_20"]  = pta.sma(df["Close"], length=20)
-    df["SMA_50"]  = pta.sma(df["Close"], length=50)
-    df["EMA_12"]  = pta.ema(df["Close"], length=12)
-    df = filter_data(df, num_period)
-
-    fig = go.Figure()
+@st.cache_data(**_FIGURE_CACHE)
+def moving_average_chart(dataframe: pd.DataFrame, num_period: str, _snapshot: dict = None, *, _ma_cols: dict = None):
+    snap   = _snapshot or ohlc_snapshot(dataframe)
+    ind    = _ma_cols if _ma_cols is not None else compute_indicators(_close_bytes(snap))
+    arrays = _window(snap, num_period, downsample=False, **{col: ind[col] for col in ("SMA_20", "SMA_50", "EMA_12")})
 
     base_traces = [
         ("Close", PALETTE["accent_cyan"],   dict(width=2.5)),
@@ -241,18 +482,22 @@ def moving_average_chart(dataframe: pd.DataFrame, num_period: str):
         ("SMA_50",  PALETTE["accent_purple"], dict(width=1.5)),
         ("EMA_12",  PALETTE["accent_green"],  dict(width=1.5, dash="dash")),
     ]
+    xy = {col: _line(arrays, col) for col, _, _ in base_traces + ma_traces}
 
-    for col, color, line_style in base_traces + ma_traces:
-        fig.add_trace(go.Scatter(
-            x=df["Date"], y=df[col],
+    fig = go.Figure(data=[
+        go.Scattergl(
+            uid=f"ma-{col}",
+            x=xy[col][0], y=xy[col][1],
             mode="lines", name=col,
             line=dict(color=color, **line_style),
-            hovertemplate=f"<b>{col}</b>: %{{y:.2f}}<extra></extra>",
-        ))
-
-    fig.update_xaxes(rangeslider_visible=True, rangeslider=dict(bgcolor=PALETTE["bg_card2"], thickness=0.06))
-    fig.update_layout(height=520, **COMMON_LAYOUT)
-    fig.update_layout(legend=dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.01, xanchor="right", x=1))
+            hovertemplate=_HOVER[col],
+        )
+        for col, color, line_style in base_traces + ma_traces
+    ])
+
+    fig.update_xaxes(**_RANGESLIDER)
+    fig.update_layout(height=520, uirevision=f"ma-{num_period}", **COMMON_LAYOUT)
+    fig.update_layout(legend=_LEGEND_TOP)
     return fig
 
 
@@ -260,34 +505,38 @@ def moving_average_chart(dataframe: pd.DataFrame, num_period: str):
 # MACD
 # ==============================
 
-def macd_chart(dataframe: pd.DataFrame, num_period: str):
-    df = dataframe.copy()
-    macd_data        = pta.macd(df["Close"])
-    df["MACD"]       = macd_data.iloc[:, 0]
-    df["MACD_Signal"]= macd_data.iloc[:, 1]
-    df["MACD_Hist"]  = macd_data.iloc[:, 2]
-    df = filter_data(df, num_period)
-
-    colors = [PALETTE["accent_green"] if v >= 0 else PALETTE["accent_red"] for v in df["MACD_Hist"]]
-
-    fig = go.Figure()
-    fig.add_bar(
-        x=df["Date"], y=df["MACD_Hist"],
-        marker_color=colors,
-        name="Histogram",
-        opacity=0.7,
-    )
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["MACD"],
-        name="MACD", line=dict(width=2, color=PALETTE["accent_blue"]),
-    ))
-    fig.add_trace(go.Scatter(
-        x=df["Date"], y=df["MACD_Signal"],
-        name="Signal", line=dict(width=2, color=PALETTE["accent_gold"], dash="dash"),
-    ))
+@st.cache_data(**_FIGURE_CACHE)
+def macd_chart(dataframe: pd.DataFrame, num_period: str, _snapshot: dict = None, *, _macd_cols: dict = None):
+    snap   = _snapshot or ohlc_snapshot(dataframe)
+    ind    = _macd_cols if _macd_cols is not None else compute_indicators(_close_bytes(snap))
+    arrays = _window(snap, num_period, **{col: ind[col] for col in ("MACD", "MACD_Signal", "MACD_Hist", "MACD_Up")})
+
+    colors = np.where(arrays["MACD_Up"], PALETTE["accent_green"], PALETTE["accent_red"])
+
+    dates = arrays["Date"]
+
+    fig = go.Figure(data=[
+        go.Bar(
+            uid="macd-Hist",
+            x=dates, y=arrays["MACD_Hist"],
+            marker_color=colors,
+            name="Histogram",
+            opacity=0.7,
+        ),
+        go.Scattergl(
+            uid="macd-MACD",
+            x=dates, y=arrays["MACD"],
+            name="MACD", line=dict(width=2, color=PALETTE["accent_blue"]),
+        ),
+        go.Scattergl(
+            uid="macd-Signal",
+            x=dates, y=arrays["MACD_Signal"],
+            name="Signal", line=dict(width=2, color=PALETTE["accent_gold"], dash="dash"),
+        ),
+    ])
 
-    fig.update_layout(height=220, **COMMON_LAYOUT)
-    fig.update_layout(legend=dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    fig.update_layout(height=220, uirevision=f"macd-{num_period}", **COMMON_LAYOUT)
+    fig.update_layout(legend=_LEGEND_SUB)
     return fig
 
 
@@ -295,6 +544,7 @@ def macd_chart(dataframe: pd.DataFrame, num_period: str):
 # FORECAST CHART
 # ==============================
 
+@st.cache_data(**_FIGURE_CACHE)
 def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None):
     """
     forecast  – DataFrame with 'Close' column (full history + 30-day forecast).
@@ -302,14 +552,24 @@ def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None
     conf_df   – Optional DataFrame with 'Lower' and 'Upper' columns (ARIMA 95% CI),
                 indexed to match the forecast rows. Falls back to ±2% if not provided.
     """
-    fig = go.Figure()
-
     historical = forecast.iloc[:-30]
     future     = forecast.iloc[-31:]   # 1-row overlap for visual continuity
 
+    # One ndarray view per segment, shared by every trace below
+    hist_dates = _dates(historical.index)
+    hist_close = _f32(historical["Close"])
+
+    keep = _lttb(hist_dates, hist_close)
+    hist_dates, hist_close = hist_dates[keep], hist_close[keep]
+    fut_dates  = _dates(future.index)
+    fut_close  = _f32(future["Close"])
+
+    traces = []
+
     # ── Historical line ────────────────────────────────────────────────────────
-    fig.add_trace(go.Scatter(
-        x=historical.index, y=historical["Close"],
+    traces.append(go.Scattergl(
+        uid="forecast-hist",
+        x=hist_dates, y=hist_close,
         mode="lines",
         name="Historical Close",
         line=dict(width=2, color=PALETTE["accent_cyan"]),
@@ -317,8 +577,9 @@ def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None
     ))
 
     # Subtle area fill under historical
-    fig.add_trace(go.Scatter(
-        x=historical.index, y=historical["Close"],
+    traces.append(go.Scattergl(
+        uid="forecast-area",
+        x=hist_dates, y=hist_close,
         fill="tozeroy",
         fillcolor="rgba(57,208,224,0.04)",
         line=dict(width=0),
@@ -330,49 +591,39 @@ def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None
     if conf_df is not None and not conf_df.empty:
         # Align conf_df to the future index (drop the overlap row if needed)
         ci = conf_df.reindex(future.index, method="nearest")
-        upper = ci["Upper"]
-        lower = ci["Lower"]
+        upper = _f32(ci["Upper"])
+        lower = _f32(ci["Lower"])
     else:
-        upper = future["Close"] * 1.02
-        lower = future["Close"] * 0.98
+        upper = fut_close * np.float32(1.02)
+        lower = fut_close * np.float32(0.98)
 
-    fig.add_trace(go.Scatter(
-        x=list(future.index) + list(future.index[::-1]),
-        y=list(upper) + list(lower[::-1]),
+    traces.append(go.Scattergl(
+        uid="forecast-ci",
+        x=np.concatenate([fut_dates, fut_dates[::-1]]),
+        y=np.concatenate([upper, lower[::-1]]),
         fill="toself",
         fillcolor="rgba(227,179,65,0.15)",
-        line=dict(width=0),
+        line=dict(width=1, color=PALETTE["accent_gold"], dash="dot"),   # outline doubles as the CI bounds
         name="95% CI Band",
         hoverinfo="skip",
     ))
 
-    # ── Upper / lower CI boundary lines ───────────────────────────────────────
-    fig.add_trace(go.Scatter(
-        x=future.index, y=upper,
-        mode="lines", name="Upper CI",
-        line=dict(width=1, color=PALETTE["accent_gold"], dash="dot"),
-        hovertemplate="<b>Upper CI</b>: %{y:.2f}<extra></extra>",
-    ))
-    fig.add_trace(go.Scatter(
-        x=future.index, y=lower,
-        mode="lines", name="Lower CI",
-        line=dict(width=1, color=PALETTE["accent_gold"], dash="dot"),
-        hovertemplate="<b>Lower CI</b>: %{y:.2f}<extra></extra>",
-    ))
-
     # ── Forecast centre line ───────────────────────────────────────────────────
-    fig.add_trace(go.Scatter(
-        x=future.index, y=future["Close"],
+    traces.append(go.Scattergl(
+        uid="forecast-line",
+        x=fut_dates, y=fut_close,
         mode="lines",
         name="30-Day Forecast",
         line=dict(width=2.5, color=PALETTE["accent_gold"]),
         hovertemplate="<b>Forecast</b>: %{y:.2f}<extra></extra>",
     ))
 
+    fig = go.Figure(data=traces)
+
     # Vertical divider at forecast start
     # add_vline with annotations is broken on date axes in many Plotly versions;
     # use add_shape + add_annotation instead.
-    vline_x = str(future.index[0].date())
+    vline_x = np.datetime_as_string(fut_dates[0], unit="D")
     fig.add_shape(
         type="line",
         x0=vline_x, x1=vline_x,
@@ -391,9 +642,10 @@ def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None
         font=dict(color=PALETTE["accent_gold"], size=11),
     )
 
-    fig.update_xaxes(rangeslider_visible=True, rangeslider=dict(bgcolor=PALETTE["bg_card2"], thickness=0.06))
+    fig.update_xaxes(**_RANGESLIDER)
     fig.update_layout(
         height=540,
+        uirevision="forecast",
         **COMMON_LAYOUT,
         title=dict(
             text="<b>30-Day Price Forecast</b>",
@@ -401,5 +653,5 @@ def Moving_average_forecast(forecast: pd.DataFrame, conf_df: pd.DataFrame = None
             x=0.01,
         ),
     )
-    fig.update_layout(legend=dict(**LEGEND_STYLE, orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    fig.update_layout(legend=_LEGEND_SUB)
     return fig
\ No newline at end of file